@@ -8,14 +8,15 @@ import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from cachetools import TTLCache
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
 from notifier import EmailNotifier
-from scraper import AmazonScraper
+from scraper import AmazonScraper, ProductData
 
 logging.basicConfig(
     level=logging.INFO,
@@ -50,8 +51,11 @@ class SearchResponse(BaseModel):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logger.info("Amazon Price Tracker API iniciada")
-    yield
+    # Chromium se lanza una sola vez; cada búsqueda solo crea un contexto nuevo
+    async with AmazonScraper() as scraper:
+        app.state.scraper = scraper
+        logger.info("Amazon Price Tracker API iniciada")
+        yield
     logger.info("API cerrada")
 
 
@@ -59,6 +63,7 @@ app = FastAPI(
     title="Amazon Price Tracker",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -74,6 +79,54 @@ static_dir.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
 
+# ── Helpers ──
+
+# Resultados recientes por query: los precios no cambian de un segundo a otro
+_search_cache: TTLCache[str, list[ProductData]] = TTLCache(maxsize=128, ttl=300)
+# Scrape en curso por query: las peticiones idénticas simultáneas esperan el mismo
+_search_inflight: dict[str, asyncio.Task[list[ProductData]]] = {}
+
+
+async def _scrape_and_cache(scraper: AmazonScraper, key: str, query: str) -> list[ProductData]:
+    """Ejecuta el scraper y guarda en caché los resultados no vacíos."""
+    resultados = await scraper.scrape(query)
+    # Una lista vacía suele ser un bloqueo de Amazon: no se cachea
+    if resultados:
+        _search_cache[key] = resultados
+    return resultados
+
+
+async def _cached_scrape(scraper: AmazonScraper, query: str) -> list[ProductData]:
+    """Ejecuta el scraper salvo que haya resultados en caché para la misma query.
+    Las peticiones que llegan mientras esa query se está scrapeando comparten el
+    resultado en curso en vez de lanzar otro scrape al terminar."""
+    key = query.lower()
+    cached = _search_cache.get(key)
+    if cached is not None:
+        return cached
+
+    task = _search_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_scrape_and_cache(scraper, key, query))
+        _search_inflight[key] = task
+
+        def _forget(done: asyncio.Task):
+            if _search_inflight.get(key) is done:
+                del _search_inflight[key]
+
+        task.add_done_callback(_forget)
+    # shield: si un cliente se desconecta no se cancela el scrape que esperan los demás
+    return await asyncio.shield(task)
+
+
+def _send_alerts(notifier: EmailNotifier, resultados: list, threshold: float) -> int:
+    """Envía un único correo con todas las alertas consolidadas.
+    Retorna cuántos productos se alertaron."""
+    if notifier.send_consolidated_alert(resultados, threshold):
+        return sum(1 for p in resultados if p.price_usd and notifier.target_price_met(p.price_usd, threshold))
+    return 0
+
+
 # ── Routes ──
 
 @app.get("/", response_class=HTMLResponse)
@@ -85,16 +138,14 @@ async def serve_frontend():
     return HTMLResponse("<h1>Frontend no encontrado</h1>", status_code=404)
 
 
-@app.post("/api/search", response_model=SearchResponse)
-async def search_products(req: SearchRequest):
+@app.post("/api/search", response_model=SearchResponse, response_class=ORJSONResponse)
+async def search_products(req: SearchRequest, request: Request):
     """Ejecuta el scraper y retorna productos encontrados."""
-    scraper = AmazonScraper()
-
-    if req.query.strip():
-        scraper.search_query = req.query.strip()
+    scraper: AmazonScraper = request.app.state.scraper
+    query = req.query.strip() or scraper.search_query
 
-    # Ejecutar scraper en un hilo separado para no bloquear el event loop
-    resultados = await scraper.scrape()
+    # Reutiliza el navegador compartido del lifespan; búsquedas repetidas salen de la caché
+    resultados = await _cached_scrape(scraper, query)
 
     if not resultados:
         return SearchResponse(
@@ -108,35 +159,28 @@ async def search_products(req: SearchRequest):
 
     # Procesar resultados
     notifier = EmailNotifier()
-    alerts_sent = 0
-    price_min = float("inf")
-    price_max = 0.0
-    products: list[ProductResult] = []
-
-    for r in resultados:
-        if r.price_usd and r.price_usd > 0:
-            price_min = min(price_min, r.price_usd)
-            price_max = max(price_max, r.price_usd)
-
-        products.append(
-            ProductResult(
-                title=r.title,
-                price_usd=r.price_usd,
-                url=r.url,
-                ships_to_colombia=r.ships_to_colombia,
-            )
+    # ProductData ya sale del scraper con los tipos correctos: model_construct evita revalidarlo
+    products = [
+        ProductResult.model_construct(
+            title=r.title,
+            price_usd=r.price_usd,
+            url=r.url,
+            ships_to_colombia=r.ships_to_colombia,
         )
+        for r in resultados
+    ]
+
+    # min()/max() recorren los precios válidos en C, sin comparaciones por item en Python
+    prices = [r.price_usd for r in resultados if r.price_usd and r.price_usd > 0]
 
-    # Enviar un único correo con todas las alertas consolidadas
-    if notifier.send_consolidated_alert(resultados, req.price_threshold):
-        deals_count = sum(1 for p in resultados if p.price_usd and notifier.target_price_met(p.price_usd, req.price_threshold))
-        alerts_sent = deals_count
+    # smtplib es bloqueante: el envío corre en un hilo para no frenar el event loop
+    alerts_sent = await asyncio.to_thread(_send_alerts, notifier, resultados, req.price_threshold)
 
     return SearchResponse(
         status=f"Busqueda completada — {len(products)} productos encontrados.",
         count=len(products),
-        price_min=price_min if price_min != float("inf") else None,
-        price_max=price_max if price_max > 0 else None,
+        price_min=min(prices, default=None),
+        price_max=max(prices, default=None),
         alerts_sent=alerts_sent,
         products=products,
     )
@@ -145,4 +189,5 @@ async def search_products(req: SearchRequest):
 if __name__ == "__main__":
     import uvicorn
 
+    # loop="auto" (por defecto) ya usa uvloop cuando está instalado
     uvicorn.run("app:app", host="127.0.0.1", port=7860, reload=True)
@@ -0,0 +1,111 @@
+"""
+Amazon Price Tracker — Caché local de productos
+Guarda en SQLite el último precio visto de cada producto para que tracker.py
+solo alerte sobre lo que cambió entre ejecuciones.
+"""
+
+import re
+import sqlite3
+import time
+from pathlib import Path
+from urllib.parse import unquote
+
+DEFAULT_DB_PATH = Path(__file__).parent / "products.db"
+
+# Un producto en rango sin cambios se vuelve a alertar pasado este tiempo
+DEFAULT_RENOTIFY_TTL = 6 * 3600
+
+_ASIN_RE = re.compile(r"/(?:dp|gp/product)/([A-Z0-9]{10})")
+
+
+def normalize_url(url: str) -> str:
+    """Clave estable por producto: el ASIN si está en la URL, si no la URL completa.
+    Los resultados patrocinados enlazan a /sspa/click?...&url=%2F...%2Fdp%2F<ASIN>,
+    por eso se decodifica antes de buscar el ASIN."""
+    match = _ASIN_RE.search(unquote(url))
+    if match:
+        return f"asin:{match.group(1)}"
+    return url
+
+
+class ProductCache:
+    def __init__(self, db_path: Path | str = DEFAULT_DB_PATH, renotify_ttl: float = DEFAULT_RENOTIFY_TTL):
+        self.renotify_ttl = renotify_ttl
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS products (
+                url TEXT PRIMARY KEY,
+                price REAL,
+                title TEXT,
+                first_seen INTEGER,
+                last_seen INTEGER,
+                last_notified INTEGER,
+                notified_price REAL
+            )"""
+        )
+        # Bases creadas antes de guardar el precio alertado
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(products)")}
+        if "notified_price" not in columns:
+            self.conn.execute("ALTER TABLE products ADD COLUMN notified_price REAL")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def pending_alerts(self, deals: list) -> list:
+        """De los productos en rango, retorna los que merecen alerta: nunca alertados,
+        con precio más bajo que el de la última alerta, o sin alertar en las últimas
+        renotify_ttl."""
+        now = int(time.time())
+        pending = []
+        seen: set[str] = set()
+        for p in deals:
+            key = normalize_url(p.url)
+            # Varias queries pueden devolver el mismo producto
+            if key in seen:
+                continue
+            seen.add(key)
+            row = self.conn.execute(
+                "SELECT notified_price, last_notified FROM products WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                pending.append(p)
+                continue
+            # Se compara contra el precio alertado, no el último visto: un precio que
+            # sube y baja dentro del rango no debe saltarse el TTL
+            notified_price, last_notified = row
+            if notified_price is None or last_notified is None or p.price_usd < notified_price:
+                pending.append(p)
+            elif now - last_notified >= self.renotify_ttl:
+                pending.append(p)
+        return pending
+
+    def record(self, products: list):
+        """Inserta o actualiza el último precio visto de cada producto."""
+        now = int(time.time())
+        self.conn.executemany(
+            """INSERT INTO products (url, price, title, first_seen, last_seen)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(url) DO UPDATE SET
+                   price = excluded.price,
+                   title = excluded.title,
+                   last_seen = excluded.last_seen""",
+            [(normalize_url(p.url), p.price_usd, p.title, now, now) for p in products],
+        )
+        self.conn.commit()
+
+    def mark_notified(self, products: list):
+        """Registra que se envió alerta para estos productos y a qué precio."""
+        now = int(time.time())
+        self.conn.executemany(
+            "UPDATE products SET last_notified = ?, notified_price = ? WHERE url = ?",
+            [(now, p.price_usd, normalize_url(p.url)) for p in products],
+        )
+        self.conn.commit()
@@ -2,8 +2,8 @@ import os
 import smtplib
 import logging
 import time
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
+import aiosmtplib
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -11,6 +11,15 @@ logger = logging.getLogger(__name__)
 # Cargar variables de entorno del archivo .env
 load_dotenv()
 
+_SEPARATOR = "-" * 55
+
+
+def _format_deal(i: int, p) -> str:
+    """Formatea un producto en rango como un bloque del cuerpo del correo."""
+    envio = "Si" if p.ships_to_colombia else "No/Desconocido"
+    return f"\n  #{i} - ${p.price_usd:,.2f}\n  {p.title}\n  Envio a Colombia: {envio}\n  {p.url}\n\n{_SEPARATOR}"
+
+
 class EmailNotifier:
     def __init__(self):
         self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
@@ -18,6 +27,22 @@ class EmailNotifier:
         self.sender_email = os.getenv("EMAIL_USER")
         self.sender_password = os.getenv("EMAIL_PASSWORD")
         self.recipient_email = os.getenv("EMAIL_RECIPIENT", self.sender_email)
+
+    def _connect(self) -> smtplib.SMTP:
+        """Abre una sesión SMTP autenticada (TCP + STARTTLS + login)."""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        server.set_debuglevel(0)
+        server.starttls()
+        server.login(self.sender_email, self.sender_password)
+        return server
+
+    def _send(self, msg):
+        """Envía el mensaje en una sesión SMTP propia."""
+        server = self._connect()
+        try:
+            server.send_message(msg)
+        finally:
+            server.quit()
     
     def target_price_met(self, price_usd: float, threshold: float = 749.99, min_price: float = 500.00) -> bool:
         """Determina si un precio está en el rango de alerta.
@@ -25,66 +50,73 @@ class EmailNotifier:
         Precios menores a min_price se ignoran (posible error o moneda incorrecta)."""
         return price_usd >= min_price and price_usd <= threshold
 
-    def send_consolidated_alert(self, products: list, threshold: float = 749.99, min_price: float = 500.00) -> bool:
-        """
-        Envía UN solo correo con todos los productos que están en el rango de alerta.
-        Recibe una lista de objetos ProductData.
-        """
+    def _prepare_alert(self, products: list, threshold: float, min_price: float) -> tuple[EmailMessage | None, int]:
+        """Filtra los productos en rango y arma el correo consolidado.
+        Retorna (None, 0) si no hay credenciales o productos que alertar."""
         if not self.sender_email or not self.sender_password:
             logger.error("Credenciales de email no configuradas en .env")
-            return False
+            return None, 0
 
         # Filtrar solo los que cumplen el rango
         deals = [p for p in products if p.price_usd and self.target_price_met(p.price_usd, threshold, min_price)]
 
         if not deals:
             logger.info("No hay productos en el rango de alerta. No se envia correo.")
-            return False
+            return None, 0
+
+        msg = EmailMessage()
+        msg['From'] = self.sender_email
+        msg['To'] = self.recipient_email
+        msg['Subject'] = f"Alerta de Precio: {len(deals)} producto(s) entre ${min_price:,.0f} y ${threshold:,.2f}"
+
+        # Construir el cuerpo del correo
+        header = "\n".join([
+            "Hola!",
+            "",
+            f"Se encontraron {len(deals)} producto(s) en tu rango de alerta (${min_price:,.0f} - ${threshold:,.2f}):",
+            "",
+            "=" * 55,
+        ])
+        items = "\n".join(_format_deal(i, p) for i, p in enumerate(deals, 1))
+        body = f"{header}\n{items}\n\n-- Amazon Price Tracker"
+        msg.set_content(body, subtype='plain', charset='utf-8')
+        return msg, len(deals)
 
+    def send_consolidated_alert(self, products: list, threshold: float = 749.99, min_price: float = 500.00) -> bool:
+        """
+        Envía UN solo correo con todos los productos que están en el rango de alerta.
+        Recibe una lista de objetos ProductData.
+        """
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.sender_email
-            msg['To'] = self.recipient_email
-            msg['Subject'] = f"Alerta de Precio: {len(deals)} producto(s) entre ${min_price:,.0f} y ${threshold:,.2f}"
-
-            # Construir el cuerpo del correo
-            lines = [
-                "Hola!",
-                "",
-                f"Se encontraron {len(deals)} producto(s) en tu rango de alerta (${min_price:,.0f} - ${threshold:,.2f}):",
-                "",
-                "=" * 55,
-            ]
-
-            for i, p in enumerate(deals, 1):
-                envio = "Si" if p.ships_to_colombia else "No/Desconocido"
-                lines.extend([
-                    f"",
-                    f"  #{i} - ${p.price_usd:,.2f}",
-                    f"  {p.title}",
-                    f"  Envio a Colombia: {envio}",
-                    f"  {p.url}",
-                    f"",
-                    "-" * 55,
-                ])
-
-            lines.extend([
-                "",
-                "-- Amazon Price Tracker",
-            ])
-
-            body = "\n".join(lines)
-            msg.attach(MIMEText(body, 'plain', 'utf-8'))
+            msg, count = self._prepare_alert(products, threshold, min_price)
+            if msg is None:
+                return False
 
             # Enviar correo
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.set_debuglevel(0)
-            server.starttls()
-            server.login(self.sender_email, self.sender_password)
-            server.send_message(msg)
-            server.quit()
+            self._send(msg)
+
+            logger.info(f"Correo consolidado enviado a {self.recipient_email} con {count} producto(s)")
+            return True
+
+        except Exception as e:
+            logger.error(f"Falla al enviar correo: {e}")
+            return False
+
+    async def send_consolidated_alert_async(self, products: list, threshold: float = 749.99, min_price: float = 500.00) -> bool:
+        """
+        Igual que send_consolidated_alert, pero con aiosmtplib: el envío no bloquea
+        el event loop y puede solaparse con otras búsquedas en curso.
+        """
+        try:
+            msg, count = self._prepare_alert(products, threshold, min_price)
+            if msg is None:
+                return False
+
+            async with aiosmtplib.SMTP(hostname=self.smtp_server, port=self.smtp_port, start_tls=True) as smtp:
+                await smtp.login(self.sender_email, self.sender_password)
+                await smtp.send_message(msg)
 
-            logger.info(f"Correo consolidado enviado a {self.recipient_email} con {len(deals)} producto(s)")
+            logger.info(f"Correo consolidado enviado a {self.recipient_email} con {count} producto(s)")
             return True
 
         except Exception as e:
@@ -1,30 +1,233 @@
 import asyncio
+import functools
+import json
 import logging
 import random
+import re
+from dataclasses import asdict, dataclass
 from typing import List, Optional
-from urllib.parse import quote_plus
-from playwright.async_api import async_playwright
-from playwright_stealth.stealth import Stealth
-from pydantic import BaseModel
+from urllib.parse import quote_plus, urlsplit
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, Response, Route, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 # Configuración de logging basado en mejores prácticas de Python Pro
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class ProductData(BaseModel):
+# Señales de bloqueo/captcha, compiladas una vez. Se separan título y contenido:
+# palabras como "robot" aparecen en el <head> normal (meta robots) y darían falsos positivos.
+_BLOCKED_TITLE_RE = re.compile(r"sorry|captcha|robot", re.IGNORECASE)
+_BLOCKED_CONTENT_RE = re.compile(
+    r"something went wrong|validatecaptcha|type the characters you see", re.IGNORECASE
+)
+
+# User agents actualizados y realistas (Chrome 131 en Linux, Windows y Mac)
+_USER_AGENTS: tuple[str, ...] = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+)
+
+# Flags de Chromium que reducen las señales de automatización
+_LAUNCH_ARGS: tuple[str, ...] = (
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-infobars",
+    "--window-size=1920,1080",
+)
+
+# Cookie que fija la moneda en USD (evita precios en COP)
+_USD_COOKIES = [{
+    "name": "i18n-prefs",
+    "value": "USD",
+    "domain": ".amazon.com",
+    "path": "/"
+}]
+
+# Precio en USD tal como lo muestra Amazon: "$1,299.99"
+_PRICE_RE = re.compile(r"\$\s*([\d,]+)\.(\d{2})")
+# Precio vigente de la tarjeta; .a-text-price es el precio de lista tachado
+_CURRENT_PRICE = "span.a-price:not(.a-text-price)"
+_OFFSCREEN_PRICE_SELECTOR = f"{_CURRENT_PRICE} > span.a-offscreen"
+_WHOLE_PRICE_SELECTOR = f"{_CURRENT_PRICE} span.a-price-whole"
+_FRACTION_PRICE_SELECTOR = f"{_CURRENT_PRICE} span.a-price-fraction"
+
+# Stealth mínimo: solo las propiedades que Amazon revisa para detectar automatización.
+# Se registra una vez por contexto como init script y toda página nueva lo hereda.
+_STEALTH_JS = """
+Object.defineProperty(Navigator.prototype, 'webdriver', { get: () => undefined });
+
+Object.defineProperty(Navigator.prototype, 'languages', { get: () => ['en-US', 'en'] });
+
+Object.defineProperty(Navigator.prototype, 'plugins', {
+    get: () => [
+        { name: 'PDF Viewer', filename: 'internal-pdf-viewer', description: 'Portable Document Format' },
+        { name: 'Chrome PDF Viewer', filename: 'internal-pdf-viewer', description: 'Portable Document Format' },
+        { name: 'Chromium PDF Viewer', filename: 'internal-pdf-viewer', description: 'Portable Document Format' },
+    ],
+});
+
+if (!window.chrome) {
+    window.chrome = { runtime: {}, app: { isInstalled: false }, csi: () => {}, loadTimes: () => {} };
+}
+
+for (const proto of [WebGLRenderingContext.prototype, WebGL2RenderingContext.prototype]) {
+    const getParameter = proto.getParameter;
+    proto.getParameter = function (parameter) {
+        // UNMASKED_VENDOR_WEBGL / UNMASKED_RENDERER_WEBGL
+        if (parameter === 37445) return 'Intel Inc.';
+        if (parameter === 37446) return 'Intel Iris OpenGL Engine';
+        return getParameter.call(this, parameter);
+    };
+}
+"""
+
+# Tarjetas de resultados que se procesan por búsqueda
+_MAX_RESULTS = 15
+
+# Selectores CSS de las tarjetas de resultados
+_CARD_SELECTOR = "div[data-component-type='s-search-result']"
+_TITLE_SELECTOR = ", ".join((
+    "h2 a span",
+    "span.a-size-medium.a-color-base.a-text-normal",
+    "span.a-size-base-plus.a-color-base.a-text-normal",
+    "h2",
+))
+
+@dataclass(slots=True)
+class ProductData:
     title: str
     price_usd: Optional[float]
     url: str
     ships_to_colombia: bool
 
+@functools.lru_cache(maxsize=256)
+def _quoted(query: str) -> str:
+    """quote_plus memoizado: la misma query se codifica en cada reintento y búsqueda."""
+    return quote_plus(query)
+
+async def launch_browser(playwright: Playwright, headless: bool = True) -> Browser:
+    """Lanza Chromium con flags que reducen las señales de automatización."""
+    return await playwright.chromium.launch(
+        headless=headless,
+        args=list(_LAUNCH_ARGS),
+    )
+
+# Recursos que el scraper nunca lee: bloquearlos reduce drásticamente los bytes por búsqueda.
+# El título sigue saliendo del 'alt' de img.s-image, que está en el HTML sin cargar la imagen.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+# Telemetría y anuncios de Amazon: peticiones que no aportan nada al resultado
+_BLOCKED_HOSTS = frozenset({"fls-na.amazon.com", "unagi.amazon.com", "aax-us-east.amazon-adsystem.com"})
+
+async def _block_heavy_resources(route: Route) -> None:
+    """Aborta imágenes, fuentes, media, CSS y telemetría; deja pasar el resto."""
+    request = route.request
+    host = urlsplit(request.url).hostname or ""
+    if (
+        request.resource_type in _BLOCKED_RESOURCE_TYPES
+        or host in _BLOCKED_HOSTS
+        or host.endswith(".amazon-adsystem.com")
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def new_browser_context(browser: Browser) -> BrowserContext:
+    """Crea un contexto con user agent realista y la moneda fijada en USD."""
+    context = await browser.new_context(
+        user_agent=random.choice(_USER_AGENTS),
+        viewport={"width": 1920, "height": 1080},
+        locale="en-US",
+        timezone_id="America/New_York",
+        # Simular permisos reales del navegador
+        permissions=["geolocation"],
+        java_script_enabled=True,
+    )
+
+    # Establecer moneda en USD
+    await context.add_cookies(_USD_COOKIES)
+    await context.route("**/*", _block_heavy_resources)
+
+    # Aplicar técnicas de stealth para evadir "Bot Detection" a nivel de contexto
+    await context.add_init_script(_STEALTH_JS)
+    return context
+
 class AmazonScraper:
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = True, max_contexts: int = 4, max_browser_uses: int = 100):
         # Query de búsqueda
         self.search_query = "Lenovo ThinkBook 16"
         self.base_url = "https://www.amazon.com"
         self.max_retries = 3
         self.headless = headless
-        
+        # Navegador de larga vida (ver __aenter__); los contextos se reutilizan mientras no haya bloqueo
+        self.max_browser_uses = max_browser_uses
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._browser_uses = 0
+        self._browser_lock = asyncio.Lock()
+        # Contextos que ya pasaron por la homepage sin bloqueo, listos para reutilizar
+        self._idle_contexts: list[BrowserContext] = []
+        # Máximo de contextos abiertos a la vez cuando varias búsquedas comparten el navegador
+        self._context_slots = asyncio.Semaphore(max_contexts)
+
+    async def __aenter__(self):
+        """Arranca Playwright y lanza Chromium una sola vez para todas las búsquedas."""
+        self._playwright = await async_playwright().start()
+        try:
+            self._browser = await launch_browser(self._playwright, self.headless)
+        except BaseException:
+            # __aexit__ no se ejecuta si __aenter__ falla: detener Playwright aquí
+            await self._playwright.stop()
+            self._playwright = None
+            raise
+        self._browser_uses = 0
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if self._browser is not None:
+                await self._browser.close()
+        finally:
+            self._browser = None
+            self._idle_contexts.clear()
+            await self._playwright.stop()
+            self._playwright = None
+        return False
+
+    async def _checkout_context(self) -> tuple[BrowserContext, bool]:
+        """Retorna un contexto y si ya está calentado (pasó por la homepage).
+        Reutiliza contextos sanos del pool; recicla el navegador tras max_browser_uses
+        búsquedas para acotar la memoria nativa de Chromium."""
+        async with self._browser_lock:
+            if self._browser_uses >= self.max_browser_uses:
+                logger.info("Reciclando el navegador...")
+                retired = self._browser
+                self._browser = await launch_browser(self._playwright, self.headless)
+                self._browser_uses = 0
+                for idle in self._idle_contexts:
+                    await idle.close()
+                self._idle_contexts.clear()
+                if not retired.contexts:
+                    await retired.close()
+            self._browser_uses += 1
+            browser = self._browser
+            if self._idle_contexts:
+                return self._idle_contexts.pop(), True
+        return await new_browser_context(browser), False
+
+    async def _checkin_context(self, context: BrowserContext, reusable: bool):
+        """Devuelve el contexto al pool o lo cierra si fue bloqueado o es de un navegador reciclado."""
+        browser = context.browser
+        if reusable and browser is self._browser:
+            self._idle_contexts.append(context)
+            return
+        await context.close()
+        # Un navegador ya reciclado se cierra cuando termina su último contexto
+        if browser is not None and browser is not self._browser and not browser.contexts:
+            await browser.close()
+
     async def _human_delay(self, min_sec: float = 1.0, max_sec: float = 3.5):
         """Simula un retraso humano aleatorio."""
         await asyncio.sleep(random.uniform(min_sec, max_sec))
@@ -44,25 +247,92 @@ class AmazonScraper:
             await page.mouse.move(x, y)
             await asyncio.sleep(random.uniform(0.1, 0.4))
 
-    def _is_blocked(self, title: str, page_content: str) -> bool:
-        """Detecta si Amazon nos bloqueó."""
-        blocked_signals = [
-            "sorry" in title.lower(),
-            "captcha" in title.lower(),
-            "robot" in title.lower(),
-            "something went wrong" in page_content.lower()[:2000],
-            "validateCaptcha" in page_content[:3000],
-            "Type the characters you see" in page_content[:3000],
-        ]
-        return any(blocked_signals)
-
-    async def scrape(self) -> List[ProductData]:
-        """Ejecuta el scraper asincrónico para buscar el producto en Amazon."""
+    def _is_blocked_fast(self, title: str, url: str, response: Optional[Response] = None) -> bool:
+        """Señales baratas de bloqueo: status 503, URL de error/captcha o título sospechoso."""
+        if response is not None and response.status == 503:
+            return True
+        if "/errors/" in url or "captcha" in url.lower():
+            return True
+        return bool(_BLOCKED_TITLE_RE.search(title))
+
+    async def _is_blocked(self, page: Page, response: Optional[Response] = None) -> bool:
+        """Detecta si Amazon nos bloqueó. Solo descarga el DOM (cientos de KB por IPC)
+        si las señales baratas no alcanzan para decidir."""
+        if self._is_blocked_fast(await page.title(), page.url, response):
+            return True
+        return bool(_BLOCKED_CONTENT_RE.search(await page.content(), 0, 3000))
+
+    def _parse_card(self, card: LexborNode) -> Optional[ProductData]:
+        """Extrae un producto de una tarjeta de resultados ya parseada."""
+        title_str = ""
+        # Estrategia primaria: extraer el texto completo de la imagen del producto
+        # Amazon siempre incluye la descripción completa en el 'alt' de su clase s-image
+        img = card.css_first("img.s-image")
+        if img is not None:
+            title_str = img.attributes.get("alt") or ""
+        
+        # Fallback a los h2/span si la imagen no da un título completo (> 15 chars)
+        if not title_str or len(title_str.strip()) < 15:
+            # Un solo recorrido con el selector unión; se queda la descripción más larga
+            candidates = (
+                node.text(separator=" ", strip=True) or node.attributes.get("aria-label") or ""
+                for node in card.css(_TITLE_SELECTOR)
+            )
+            title_str = max((title_str.strip(), *(c.strip() for c in candidates)), key=len)
+        
+        title_str = title_str.strip()
+        if not title_str:
+            return None
+            
+        # Extract Link
+        link = card.css_first("h2 a") or card.css_first("a.a-link-normal")
+        href = link.attributes.get("href") if link is not None else None
+        if not href:
+            return None
+        url = f"{self.base_url}{href}"
+            
+        # Extraer precio: span.a-offscreen trae el precio canónico ("$1,299.99"). Se excluye
+        # .a-text-price, el precio de lista tachado que Amazon muestra aun sin oferta vigente
+        price = 0.0
+        offscreen = card.css_first(_OFFSCREEN_PRICE_SELECTOR)
+        match = _PRICE_RE.search(offscreen.text()) if offscreen is not None else None
+        if match:
+            price = float(f"{match.group(1).replace(',', '')}.{match.group(2)}")
+        else:
+            # Fallback: armar el precio con entero + fracción del precio vigente
+            whole = card.css_first(_WHOLE_PRICE_SELECTOR)
+            if whole is not None:
+                clean_price = whole.text().replace(',', '').replace('.', '').strip()
+                fraction = card.css_first(_FRACTION_PRICE_SELECTOR)
+                frac_text = fraction.text().strip() if fraction is not None else "00"
+                if clean_price.isdigit() and frac_text.isdigit():
+                    price = float(f"{clean_price}.{frac_text}")
+                
+        # Delivery info (Colombia check)
+        delivery = card.css_first("[data-cy='delivery-recipe']")
+        ships_to_colombia = delivery is not None and "Colombia" in delivery.text()
         
+        if "Lenovo" not in title_str and price <= 0:
+            return None
+        return ProductData(
+            title=title_str,
+            price_usd=price,
+            url=url,
+            ships_to_colombia=ships_to_colombia
+        )
+
+    async def scrape(self, query: Optional[str] = None) -> List[ProductData]:
+        """Ejecuta el scraper asincrónico para buscar el producto en Amazon.
+        Si no se usa dentro de `async with`, lanza y cierra su propio navegador."""
+        if self._browser is None:
+            async with self:
+                return await self.scrape(query)
+
+        query = query or self.search_query
         for attempt in range(1, self.max_retries + 1):
             logger.info(f"Intento {attempt} de {self.max_retries}...")
             
-            result = await self._attempt_scrape()
+            result = await self._attempt_scrape(query)
             
             if result is not None:
                 return result
@@ -75,212 +345,127 @@ class AmazonScraper:
         logger.error("Se agotaron todos los reintentos.")
         return []
 
-    async def _attempt_scrape(self) -> Optional[List[ProductData]]:
+    async def _attempt_scrape(self, query: str) -> Optional[List[ProductData]]:
         """Un intento individual de scraping. Retorna None si fue bloqueado."""
-        async with async_playwright() as p:
-            # User agents actualizados y realistas (Chrome 131 en Linux)
-            user_agents = [
-                "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-            ]
-            
-            browser = await p.chromium.launch(
-                headless=self.headless,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-infobars",
-                    "--window-size=1920,1080",
-                ]
-            )
-
-            context = await browser.new_context(
-                user_agent=random.choice(user_agents),
-                viewport={"width": 1920, "height": 1080},
-                locale="en-US",
-                timezone_id="America/New_York",
-                # Simular permisos reales del navegador
-                permissions=["geolocation"],
-                java_script_enabled=True,
-            )
-            
-            # Establecer moneda en USD
-            await context.add_cookies([{
-                "name": "i18n-prefs",
-                "value": "USD",
-                "domain": ".amazon.com",
-                "path": "/"
-            }])
-            
-            page = await context.new_page()
-            
-            # Aplicar técnicas de stealth para evadir "Bot Detection"
-            stealth = Stealth()
-            await stealth.apply_stealth_async(page)
-            
+        async with self._context_slots:
+            context, warmed = await self._checkout_context()
+            result = None
             try:
+                result = await self._scrape_with_context(context, query, warm_up=not warmed)
+                return result
+            finally:
+                # Solo se reutiliza un contexto que completó la búsqueda con resultados: uno
+                # bloqueado, con error de red o sin grid pudo no terminar el calentamiento
+                await self._checkin_context(context, reusable=bool(result))
+
+    async def _scrape_with_context(self, context: BrowserContext, query: str, warm_up: bool = True) -> Optional[List[ProductData]]:
+        """Abre una página nueva en el contexto dado y extrae los productos.
+        Con warm_up pasa primero por la homepage, como lo haría un humano."""
+        page = await context.new_page()
+
+        try:
+            search_url = f"{self.base_url}/s?k={_quoted(query)}"
+            if warm_up:
                 # === PASO 1: Ir primero a la homepage (como un humano) ===
                 logger.info("Navegando a la homepage de Amazon...")
-                await page.goto(self.base_url, wait_until="domcontentloaded", timeout=60000)
-                await self._human_delay(2.0, 4.0)
-                await self._simulate_mouse_movement(page)
-                
-                # Verificar si la homepage ya nos bloqueó
-                title = await page.title()
-                content = await page.content()
-                if self._is_blocked(title, content):
+                response = await page.goto(self.base_url, wait_until="commit", timeout=60000)
+                if self._is_blocked_fast("", page.url, response):
                     logger.warning("Bloqueado en la homepage. Abortando intento.")
-                    await browser.close()
                     return None
-                
+            
                 # === PASO 2: Usar la barra de búsqueda como un humano ===
-                logger.info(f"Buscando: {self.search_query}")
+                logger.info(f"Buscando: {query}")
                 search_box = page.locator("#twotabsearchtextbox")
-                
-                if await search_box.count() > 0:
-                    await search_box.click()
-                    await self._human_delay(0.5, 1.0)
-                    
-                    # Escribir carácter por carácter (simula tipeo humano)
-                    for char in self.search_query:
-                        await search_box.press(char)
-                        await asyncio.sleep(random.uniform(0.05, 0.15))
-                    
-                    await self._human_delay(0.5, 1.5)
-                    await page.keyboard.press("Enter")
-                else:
+            
+                # Sin espera fija: la barra de búsqueda marca que la homepage es utilizable
+                try:
+                    await search_box.wait_for(timeout=15000)
+                except PlaywrightTimeoutError:
+                    # Verificar si la homepage ya nos bloqueó
+                    if await self._is_blocked(page, response):
+                        logger.warning("Bloqueado en la homepage. Abortando intento.")
+                        return None
                     # Fallback: navegar directamente a la URL de búsqueda
                     logger.info("No se encontró barra de búsqueda, usando URL directa.")
-                    search_url = f"{self.base_url}/s?k={quote_plus(self.search_query)}"
-                    await page.goto(search_url, wait_until="domcontentloaded", timeout=60000)
+                    response = await page.goto(search_url, wait_until="commit", timeout=60000)
+                else:
+                    await self._simulate_mouse_movement(page)
+                    await search_box.click()
+                    await self._human_delay(0.5, 1.0)
                 
-                await self._human_delay(2.0, 4.0)
-                await self._smooth_scroll(page)
+                    # Escribir carácter por carácter (simula tipeo humano); el driver aplica
+                    # la pausa entre teclas, así todo el texto va en un solo round-trip
+                    await search_box.press_sequentially(query, delay=random.randint(60, 120))
                 
-                # === PASO 3: Verificar bloqueo en resultados ===
-                title = await page.title()
-                content = await page.content()
-                if self._is_blocked(title, content):
+                    await self._human_delay(0.5, 1.5)
+                    await page.keyboard.press("Enter")
+                    response = None
+            else:
+                # Contexto ya calentado (cookies de una sesión previa sin bloqueo):
+                # se omite la homepage y se va directo a los resultados
+                logger.info(f"Buscando (URL directa): {query}")
+                response = await page.goto(search_url, wait_until="commit", timeout=60000)
+            
+            # === PASO 3: Esperar los resultados o detectar bloqueo ===
+            # Un 503 o una URL de captcha se detectan sin esperar ni tocar el DOM
+            if self._is_blocked_fast("", page.url, response):
+                logger.warning("Bloqueado en la página de resultados.")
+                return None
+
+            # Sin espera fija: el grid de resultados marca cuándo la página es utilizable
+            try:
+                await page.wait_for_selector(_CARD_SELECTOR, timeout=20000)
+            except Exception:
+                await page.screenshot(path="debug_amazon.png")
+                if await self._is_blocked(page, response):
                     logger.warning("Bloqueado en la página de resultados.")
-                    await page.screenshot(path="debug_amazon.png")
-                    await browser.close()
                     return None
-                
-                # Esperar a que carguen los resultados
-                try:
-                    await page.wait_for_selector("div[data-component-type='s-search-result']", timeout=15000)
-                except Exception:
-                    logger.info("No se encontraron resultados del grid. Guardando debug...")
-                    await page.screenshot(path="debug_amazon.png")
-                    with open("debug_amazon.html", "w", encoding="utf-8") as f:
-                        f.write(await page.content())
-                    await browser.close()
-                    return []
-                
-                # === PASO 4: Extraer productos ===
-                await self._smooth_scroll(page, steps=4)
-                await self._human_delay(1.0, 2.0)
-                
-                products = []
-                cajas_resultados = await page.locator("div[data-component-type='s-search-result']").all()
-                logger.info(f"Se encontraron {len(cajas_resultados)} resultados en la página.")
-                
-                for index, item in enumerate(cajas_resultados[:15]): 
-                    try:
-                        title_str = ""
-                        # Estrategia primaria: extraer el texto completo de la imagen del producto
-                        # Amazon siempre incluye la descripción completa en el 'alt' de su clase s-image
-                        img_loc = item.locator("img.s-image").first
-                        if await img_loc.count() > 0:
-                            title_str = await img_loc.get_attribute("alt") or ""
-                        
-                        # Fallback a los h2/span si la imagen no da un título completo (> 15 chars)
-                        if not title_str or len(title_str.strip()) < 15:
-                            title_locators = [
-                                item.locator("h2 a span").first,
-                                item.locator("span.a-size-medium.a-color-base.a-text-normal").first,
-                                item.locator("span.a-size-base-plus.a-color-base.a-text-normal").first,
-                                item.locator("h2").first
-                            ]
-                            
-                            for loc in title_locators:
-                                if await loc.count() > 0:
-                                    temp_str = await loc.inner_text()
-                                    if not temp_str.strip():
-                                        temp_str = await loc.get_attribute("aria-label") or ""
-                                    
-                                    # Si encontramos una mejor descripción, la tomamos
-                                    if temp_str and len(temp_str.strip()) > len(title_str.strip()):
-                                        title_str = temp_str.strip()
-                                        if len(title_str) > 20:
-                                            break
-                        
-                        title_str = title_str.strip()
-                        if not title_str:
-                            continue
-                            
-                        # Extract Link
-                        link_locator = item.locator("h2 a").first
-                        if await link_locator.count() == 0:
-                            link_locator = item.locator("a.a-link-normal").first
-                        
-                        if await link_locator.count() == 0:
-                            continue
-                            
-                        href = await link_locator.get_attribute("href")
-                        url = f"{self.base_url}{href}" if href else ""
-                        if not url:
-                            continue
-                            
-                        # Extraer precio 
-                        price = 0.0
-                        price_whole_loc = item.locator("span.a-price-whole").first
-                        if await price_whole_loc.count() > 0:
-                            price_text = await price_whole_loc.inner_text()
-                            price_fraction_loc = item.locator("span.a-price-fraction").first
-                            frac_text = await price_fraction_loc.inner_text() if await price_fraction_loc.count() > 0 else "00"
-                            
-                            clean_price = price_text.replace(',', '').replace('.', '').strip()
-                            if clean_price.isdigit():
-                                price = float(f"{clean_price}.{frac_text}")
-                                
-                        # Delivery info (Colombia check)
-                        ships_to_colombia = False
-                        delivery_loc = item.locator("[data-cy='delivery-recipe']").first
-                        if await delivery_loc.count() > 0:
-                            delivery_text = await delivery_loc.inner_text()
-                            if "Colombia" in delivery_text:
-                                ships_to_colombia = True
-                        
-                        if "Lenovo" in title_str or price > 0:            
-                            products.append(ProductData(
-                                title=title_str,
-                                price_usd=price,
-                                url=url,
-                                ships_to_colombia=ships_to_colombia
-                            ))
-                    except Exception as eval_elem_e:
-                        logger.debug(f"Falla evaluando elemento {index}: {eval_elem_e}")
-                        continue
-                
-                return products
-                
-            except Exception as e:
-                logger.error(f"Error durante el scraping: {e}")
+                logger.info("No se encontraron resultados del grid. Guardando debug...")
+                with open("debug_amazon.html", "w", encoding="utf-8") as f:
+                    f.write(await page.content())
                 return []
-            finally:
-                await browser.close()
+            
+            # === PASO 4: Extraer productos ===
+            await self._smooth_scroll(page, steps=4)
+            await self._human_delay(1.0, 2.0)
+            
+            # Una sola llamada al navegador trae el HTML de las primeras tarjetas
+            # (no todo el DOM) y selectolax (parser en C) lo recorre en proceso
+            cards_html = await page.eval_on_selector_all(
+                _CARD_SELECTOR,
+                "(cards, n) => cards.slice(0, n).map(card => card.outerHTML)",
+                _MAX_RESULTS,
+            )
+            tree = LexborHTMLParser("".join(cards_html))
+            cajas_resultados = tree.css(_CARD_SELECTOR)[:_MAX_RESULTS]
+            logger.info(f"Se encontraron {len(cajas_resultados)} resultados en la página.")
+            
+            products = []
+            for index, card in enumerate(cajas_resultados):
+                try:
+                    product = self._parse_card(card)
+                except Exception as eval_elem_e:
+                    logger.debug(f"Falla evaluando elemento {index}: {eval_elem_e}")
+                    continue
+                if product is not None:
+                    products.append(product)
+            
+            return products
+            
+        except Exception as e:
+            logger.error(f"Error durante el scraping: {e}")
+            return []
+        finally:
+            await page.close()
 
 # Para pruebas locales rápidas
 if __name__ == "__main__":
     async def test():
-        scraper = AmazonScraper()
-        resultados = await scraper.scrape()
+        async with AmazonScraper() as scraper:
+            resultados = await scraper.scrape()
         if not resultados:
             print("No se extrajeron productos. Es posible que el DOM de Amazon haya cambiado o sigamos bloqueados.")
         for r in resultados:
-            print(r.model_dump_json(indent=2))
+            print(json.dumps(asdict(r), indent=2, ensure_ascii=False))
             
     asyncio.run(test())
@@ -5,15 +5,27 @@ Ejecuta el scraper y envía alertas por correo sin necesidad de interfaz web.
 Uso:
     uv run tracker.py
     uv run tracker.py --query "MacBook Air M3"
+    uv run tracker.py --query "Lenovo ThinkBook 16" "MacBook Air M3" --pool-size 2
+    uv run tracker.py --query "Lenovo ThinkBook 16" "MacBook Air M3" "Dell XPS 13" --workers 3
     uv run tracker.py --threshold 600 --min-price 400
 """
 
 import argparse
 import asyncio
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 
+from cache import ProductCache
 from notifier import EmailNotifier
-from scraper import AmazonScraper
+from scraper import AmazonScraper, ProductData
+
+# uvloop.run construye un único loop basado en libuv; sin uvloop se usa asyncio.run
+try:
+    from uvloop import run as run_loop
+except ImportError:
+    from asyncio import run as run_loop
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,16 +34,54 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def main(query: str, threshold: float, min_price: float):
+async def scrape_queries(queries: list[str], pool_size: int) -> list[list[ProductData]]:
+    """Ejecuta las queries en paralelo sobre un mismo navegador,
+    con a lo sumo pool_size contextos abiertos a la vez."""
+    async with AmazonScraper(headless=True, max_contexts=pool_size) as scraper:
+        return await asyncio.gather(*(scraper.scrape(q) for q in queries))
+
+
+def _scrape_queries_in_worker(queries: list[str], pool_size: int) -> list[list[ProductData]]:
+    """Punto de entrada de cada proceso worker: su propio loop y su propio navegador."""
+    return run_loop(scrape_queries(queries, pool_size))
+
+
+async def scrape_queries_multiprocess(queries: list[str], pool_size: int, workers: int) -> list[list[ProductData]]:
+    """Reparte las queries entre varios procesos, cada uno con su Chromium, para escalar
+    con los núcleos en lugar de multiplexar todo el IPC de Playwright en un solo proceso."""
+    workers = min(workers, len(queries), os.cpu_count() or 1)
+    # Reparto round-robin: el worker i recibe las queries i, i + workers, ...
+    chunks = [queries[i::workers] for i in range(workers)]
+
+    loop = asyncio.get_running_loop()
+    # spawn: no se hereda por fork el estado del event loop ni de Playwright del padre
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        partials = await asyncio.gather(*(
+            loop.run_in_executor(executor, _scrape_queries_in_worker, chunk, pool_size)
+            for chunk in chunks
+        ))
+
+    por_query: list[list[ProductData]] = [[] for _ in queries]
+    for i, partial in enumerate(partials):
+        por_query[i::workers] = partial
+    return por_query
+
+
+async def main(queries: list[str], threshold: float, min_price: float, pool_size: int = 4, workers: int = 1):
     """Ejecuta el scraper y envía alertas automáticamente."""
 
-    logger.info(f"Iniciando busqueda: '{query}'")
+    logger.info(f"Iniciando busqueda: {', '.join(repr(q) for q in queries)}")
     logger.info(f"Rango de alerta: ${min_price:,.2f} — ${threshold:,.2f}")
 
     # Ejecutar scraper
-    scraper = AmazonScraper(headless=True)
-    scraper.search_query = query
-    resultados = await scraper.scrape()
+    if workers > 1 and len(queries) > 1:
+        por_query = await scrape_queries_multiprocess(queries, pool_size, workers)
+    else:
+        por_query = await scrape_queries(queries, pool_size)
+
+    for query, encontrados in zip(queries, por_query):
+        logger.info(f"'{query}': {len(encontrados)} productos.")
+    resultados = [r for encontrados in por_query for r in encontrados]
 
     if not resultados:
         logger.warning("No se encontraron resultados o Amazon bloqueo la solicitud.")
@@ -48,30 +98,49 @@ async def main(query: str, threshold: float, min_price: float):
         en_rango = " *** EN RANGO ***" if r.price_usd and notifier.target_price_met(r.price_usd, threshold, min_price) else ""
         logger.info(f"  -> {r.title[:60]}... | {precio_texto} | Envio CO: {envio}{en_rango}")
 
-    # Enviar UN solo correo con todos los productos en rango
-    enviado = notifier.send_consolidated_alert(resultados, threshold, min_price)
-    deals_count = sum(1 for r in resultados if r.price_usd and notifier.target_price_met(r.price_usd, threshold, min_price))
+    deals = [r for r in resultados if r.price_usd and notifier.target_price_met(r.price_usd, threshold, min_price)]
+    deals_count = len(deals)
+
+    # Solo se alerta lo nuevo, lo que bajó de precio o lo no alertado recientemente
+    with ProductCache() as cache:
+        pendientes = cache.pending_alerts(deals)
+        cache.record(resultados)
+
+        # Enviar UN solo correo con todos los productos en rango pendientes
+        enviado = await notifier.send_consolidated_alert_async(pendientes, threshold, min_price)
+        if enviado:
+            cache.mark_notified(pendientes)
 
     # Resumen final
     print()
     print("=" * 60)
     print(f"  RESUMEN DE BUSQUEDA")
     print("=" * 60)
-    print(f"  Producto buscado : {query}")
+    print(f"  Producto buscado : {', '.join(queries)}")
     print(f"  Resultados       : {len(resultados)}")
     print(f"  En rango alerta  : {deals_count}")
+    print(f"  Nuevos/bajaron   : {len(pendientes)}")
     print(f"  Correo enviado   : {'Si' if enviado else 'No'}")
     print(f"  Rango de alerta  : ${min_price:,.2f} — ${threshold:,.2f}")
     print("=" * 60)
 
 
+def _positive_int(value: str) -> int:
+    """Tipo de argparse para enteros >= 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"debe ser un entero mayor o igual a 1: {value}")
+    return number
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Amazon Price Tracker - Alertas automaticas")
     parser.add_argument(
         "--query", "-q",
         type=str,
-        default="Lenovo ThinkBook 16",
-        help="Producto a buscar (default: Lenovo ThinkBook 16)",
+        nargs="+",
+        default=["Lenovo ThinkBook 16"],
+        help="Producto(s) a buscar (default: Lenovo ThinkBook 16)",
     )
     parser.add_argument(
         "--threshold", "-t",
@@ -86,5 +155,19 @@ if __name__ == "__main__":
         help="Precio minimo para alerta en USD (default: 500.00)",
     )
 
+    parser.add_argument(
+        "--pool-size", "-p",
+        type=_positive_int,
+        default=4,
+        help="Maximo de busquedas simultaneas en el navegador (default: 4)",
+    )
+
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="Procesos para repartir varias queries, cada uno con su navegador (default: 1)",
+    )
+
     args = parser.parse_args()
-    asyncio.run(main(args.query, args.threshold, args.min_price))
+    run_loop(main(args.query, args.threshold, args.min_price, args.pool_size, args.workers))